@@ -5,7 +5,7 @@ from PySide6.QtWidgets import (
     QPushButton, QFileDialog, QMessageBox, QLabel,
     QTreeWidget, QTreeWidgetItem, QMenuBar, QMenu,
     QPlainTextEdit, QTextEdit, QSplitter, QLineEdit,
-    QToolButton, QSizePolicy, QTreeWidgetItemIterator,
+    QToolButton, QSizePolicy,
     QInputDialog, QStyledItemDelegate, QStyleOptionViewItem, QStyle
 )
 from PySide6.QtGui import (
@@ -14,12 +14,160 @@ from PySide6.QtGui import (
     QTextCursor, QShortcut, QKeySequence, QTextDocument
 )
 
+import bisect
+import html
+import itertools
 import json
+import math
 import re
 import sys
 from string_format_app import FormatterWindow
 from timestamp_converter_app import TimestampConverterWindow
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
+# ====== JSON 树配置 ======
+TREE_TEXT_COLOR = QColor("#62b37a")  # 中间树的文字颜色
+TREE_LAZY_ROLE = Qt.UserRole + 1  # 标记容器节点的子节点尚未加载
+TREE_LAZY_PLACEHOLDER = "…"  # 未加载子节点时的占位子节点文字
+TREE_PAGE_ROLE = Qt.UserRole + 2  # 分页节点中第一个元素在原容器中的下标
+TREE_PAGE_SIZE = 1000  # 子节点超过该数量时按页分组，展开某一页时才创建该页的子节点
+TREE_JSON_ROLE = Qt.UserRole + 3  # 点击节点后缓存的格式化 JSON 文本，再次点击同一节点时直接复用
+
+# ====== 嵌套 JSON 解析配置 ======
+PLAIN_STRING_CACHE_SIZE = 4096  # 最多记住多少个“看起来像 JSON 但解析失败”的字符串
+
+# ====== 宽松 JSON 修复用到的正则（模块加载时编译一次） ======
+CODE_FENCE_PATTERN = re.compile(r'^\s*```(?:json)?\s*([\s\S]*?)\s*```\s*$', re.IGNORECASE)  # Markdown 代码块
+TRAILING_BACKSLASH_PATTERN = re.compile(r'\\\s*$')  # 末尾多余的反斜杠
+ESCAPED_JSON_START_PATTERN = re.compile(r'^\s*[\{\[]\\"')  # 整段被转义过的 JSON，如 {\"a\": 1}
+ESCAPED_QUOTE_PATTERN = re.compile(r'(?<!\\)\\"')  # 未被再次转义的 \"
+BACKTICK_STRING_PATTERN = re.compile(r'`([^`\\]*(?:\\.[^`\\]*)*)`')  # 反引号包裹的字符串
+TRAILING_COMMA_PATTERN = re.compile(r',(\s*[}\]])')  # 右括号前多余的逗号
+TRAILING_BACKSLASHES_PATTERN = re.compile(r'\\+$')  # 未闭合字符串末尾的反斜杠
+LEADING_WHITESPACE_PATTERN = re.compile(r'\s*')  # 行首缩进
+
+# ====== 从混合文本中提取 JSON 用到的正则 ======
+JSON_OPEN_BRACKET_PATTERN = re.compile(r'[{\[]')  # 第一个左括号（不区分是否在字符串内）
+# 一个完整的字符串（未闭合时到文本末尾）或一个括号；字符串整段匹配，其中的括号不会被单独匹配到
+JSON_STRUCTURE_PATTERN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"?|[{}\[\]]', re.DOTALL)
+
+# ====== JSON 编解码适配层 ======
+# orjson 会把超出 64 位的整数解析成 float 造成精度丢失，出现长数字时交给标准库解析
+LONG_INTEGER_PATTERN = re.compile(r'\d{19,}')
+# 可能溢出成 Infinity 的数字（指数至少三位，或整数部分超过 308 位）
+FLOAT_OVERFLOW_PATTERN = re.compile(r'[eE]\+?\d{3,}|\d{309,}')
+
+
+class NonFiniteFloat(float):
+    """
+    标准库解析出的 NaN / Infinity / 溢出的数字。
+    orjson 会把非有限浮点数静默写成 null，但不支持序列化 float 的子类：
+    用子类标记后，序列化时 orjson 抛出 JSONEncodeError，交给标准库原样输出 NaN / Infinity。
+    """
+
+
+def parse_json_constant(name):
+    return NonFiniteFloat(name)
+
+
+def parse_json_float(text):
+    value = float(text)
+    return value if math.isfinite(value) else NonFiniteFloat(value)
+
+
+def json_loads(text):
+    """
+    解析 JSON 文本，优先使用 orjson。
+    orjson 解析失败时再用标准库解析一次：既兼容 NaN 等标准库扩展语法，
+    也保证抛出的 JSONDecodeError 带有标准库的 msg / lineno / colno。
+    """
+    if orjson is not None and not LONG_INTEGER_PATTERN.search(text):
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    # 标准库解析出的非有限浮点数都换成 NonFiniteFloat；只有可能溢出时才逐个检查数字，避免拖慢常见情况
+    if FLOAT_OVERFLOW_PATTERN.search(text):
+        return json.loads(text, parse_constant=parse_json_constant, parse_float=parse_json_float)
+    return json.loads(text, parse_constant=parse_json_constant)
+
+
+def json_loads_stripped(text):
+    """
+    解析输入框中的 JSON 文本。先直接解析（不复制文本）；失败且首尾有空白时，
+    去掉首尾空白再解析一次——str.strip 会去掉全角空格、换页符等 JSON 本身不接受的空白
+    """
+    try:
+        return json_loads(text)
+    except json.JSONDecodeError:
+        if not (text[:1].isspace() or text[-1:].isspace()):
+            raise
+    return json_loads(text.strip())
+
+
+def json_dumps_indent(data):
+    """
+    序列化为带缩进的 JSON 文本（2 空格缩进，保留非 ASCII 字符）
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except orjson.JSONEncodeError:
+            pass  # 超出 64 位的整数、NaN / Infinity 等 orjson 不支持的值
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def json_dumps_compact(data):
+    """
+    序列化为压缩后的 JSON 文本（无多余空白，保留非 ASCII 字符）
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+# ====== JSON 树节点数据 ======
+# 树节点的文字、子节点和分页都由这里根据数据计算，
+# 创建节点和不创建节点直接在数据上搜索时保持完全一致
+def tree_item_text(key_name, data):
+    """
+    节点显示的文字：容器只显示 key，叶子节点显示 key: 值
+    """
+    if isinstance(data, (dict, list)):
+        return key_name or ""
+    return f"{key_name}: {data}" if key_name else str(data)
+
+
+def tree_child_entries(data, first_index=0):
+    """
+    容器的子节点 (key, 值)，列表元素的 key 是其在原容器中的下标
+    """
+    if isinstance(data, dict):
+        return data.items()
+    return ((f"[{i}]", v) for i, v in enumerate(data, first_index))
+
+
+def tree_page_slices(data):
+    """
+    超大容器按 TREE_PAGE_SIZE 分页，依次产出 (起始下标, 结束下标, 该页的数据切片)
+    """
+    dict_items = iter(data.items()) if isinstance(data, dict) else None
+    for start in range(0, len(data), TREE_PAGE_SIZE):
+        end = min(start + TREE_PAGE_SIZE, len(data))
+        if dict_items is not None:
+            page = dict(itertools.islice(dict_items, TREE_PAGE_SIZE))
+        else:
+            page = data[start:end]
+        yield start, end, page
+
+
 # ====== 主题配置 ======
 THEMES = {
     "light": {
@@ -119,14 +267,30 @@ class CodeEditor(QPlainTextEdit):
     支持行号显示的 QPlainTextEdit
     并实现 placeholder 功能
     """
+    # 文本内容真正被修改时发出。textChanged 在高亮器只改格式（搜索高亮等）时也会发出，
+    # 折叠区域重算、自动格式化这类整篇操作改为连接这个信号
+    text_modified = QtCore.Signal()
+
     def __init__(self, placeholder=""):
         super().__init__()
         self.placeholder = placeholder
         self.theme = THEMES["light"]  # 默认主题
-        self.textChanged.connect(self.update)  # 内容变化时刷新 placeholder
+        # 当前行高亮的选区对象复用，光标移动时只更新其中的光标
+        self.current_line_selection = QTextEdit.ExtraSelection()
+        self.current_line_selection.format.setProperty(QTextFormat.FullWidthSelection, True)
+        self.refresh_theme_colors()
         self.lineNumberArea = LineNumberArea(self)
+
+        # 同一轮事件循环内的多次光标变化只刷新一次当前行高亮
+        self.current_line_timer = QtCore.QTimer(self)
+        self.current_line_timer.setSingleShot(True)
+        self.current_line_timer.setInterval(0)
+        self.current_line_timer.timeout.connect(self.highlight_current_line)
+        self.placeholder_visible = bool(self.placeholder)
+        self.textChanged.connect(self.refresh_placeholder)  # 内容变化时刷新 placeholder
         
         self.search_extra_selections = []  # 存储搜索高亮
+        self.search_highlighter = None  # 标出全部搜索匹配的高亮器（由使用方设置）
         self.folding_enabled = False
         self.fold_regions = {}
         self.folded_starts = set()
@@ -135,12 +299,17 @@ class CodeEditor(QPlainTextEdit):
         self._updating_fold_placeholder = False
         self.fold_gutter_width = 7
         self.fold_symbol_gap = 5
+        # 行号区宽度及其用到的字宽、位数做缓存，字体 / 块数 / 折叠开关变化时才重新计算
+        self.refresh_font_metrics()
+        self.line_number_digits = 1
+        self.line_number_width = 0
 
         # 绑定信号
         self.blockCountChanged.connect(self.update_line_number_area_width)  # 块数量变化时更新宽度
         self.updateRequest.connect(self.update_line_number_area)  # 滚动/更新时刷新行号
-        self.cursorPositionChanged.connect(self.highlight_current_line)  # 光标行高亮
-        self.textChanged.connect(self.rebuild_fold_regions)
+        self.cursorPositionChanged.connect(self.current_line_timer.start)  # 光标行高亮
+        self.document().contentsChange.connect(self.on_contents_change)
+        self.text_modified.connect(self.rebuild_fold_regions)
 
         self.update_line_number_area_width(0)
         self.highlight_current_line()
@@ -148,6 +317,7 @@ class CodeEditor(QPlainTextEdit):
 
     def set_theme(self, theme_config):
         self.theme = theme_config
+        self.refresh_theme_colors()
         self.highlight_current_line()
         self.update()  # 触发重绘（包括 placeholder）
         self.lineNumberArea.update() # 触发重绘行号
@@ -163,46 +333,69 @@ class CodeEditor(QPlainTextEdit):
             }}
         """)
 
+    def refresh_theme_colors(self):
+        # 绘制时用到的主题颜色提前构造好，避免每次重绘都新建 QColor
+        self.line_num_bg_color = QColor(self.theme["line_num_bg"])
+        self.line_num_text_color = QColor(self.theme["line_num_text"])
+        self.current_line_color = QColor(self.theme["current_line"])
+        self.current_line_selection.format.setBackground(self.current_line_color)
+        self.placeholder_color = QColor(self.theme["placeholder"])
+
     # ====== 行号宽度计算 ======
+    def refresh_font_metrics(self):
+        metrics = self.fontMetrics()
+        self.digit_advance = metrics.horizontalAdvance('9')
+        self.fold_symbol_advance = metrics.horizontalAdvance("▶")
+        self.line_height = metrics.height()
+        # 折叠符号的宽度只随字体变化，绘制行号区时直接查表
+        self.fold_symbol_widths = {symbol: metrics.horizontalAdvance(symbol) for symbol in ("▶", "▼")}
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QtCore.QEvent.FontChange:
+            self.refresh_font_metrics()
+            self.update_line_number_area_width(0)
+
     def fold_area_width(self):
         if not self.folding_enabled:
             return 0
-        symbol_width = self.fontMetrics().horizontalAdvance("▶")
-        return max(self.fold_gutter_width, symbol_width + self.fold_symbol_gap)
+        return max(self.fold_gutter_width, self.fold_symbol_advance + self.fold_symbol_gap)
 
     def line_number_area_width(self):
-        digits = len(str(max(1, self.blockCount())))
-        fold_width = self.fold_area_width()
-        space = 6 + self.fontMetrics().horizontalAdvance('9') * digits + fold_width
-        return space
+        return self.line_number_width
 
-    def update_line_number_area_width(self, _):
-        # 设置编辑器左侧边距，为行号留空间
-        self.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
+    def update_line_number_area_width(self, block_count):
+        # 重新计算行号区宽度，并设置编辑器左侧边距为行号留空间（宽度没变时不重复设置）
+        self.line_number_digits = len(str(max(1, self.blockCount())))
+        width = 6 + self.digit_advance * self.line_number_digits + self.fold_area_width()
+        if width != self.line_number_width:
+            self.line_number_width = width
+            self.setViewportMargins(width, 0, 0, 0)
+            self.update_line_number_area_geometry()
 
     def update_line_number_area(self, rect, dy):
-        # 滚动或更新时刷新行号
+        # 滚动或更新时刷新行号（宽度只随块数、字体、折叠开关变化，已在对应信号中更新）
         if dy:
             self.lineNumberArea.scroll(0, dy)
         else:
-            self.lineNumberArea.update(0, rect.y(), self.line_number_area_width(), rect.height())
-        if rect.contains(self.viewport().rect()):
-            self.update_line_number_area_width(0)
+            self.lineNumberArea.update(0, rect.y(), self.line_number_width, rect.height())
 
     def resizeEvent(self, event):
         # 调整编辑器大小时，重新布局行号区域
         super().resizeEvent(event)
+        self.update_line_number_area_geometry()
+
+    def update_line_number_area_geometry(self):
         cr = self.contentsRect()
         self.lineNumberArea.setGeometry(
-            QtCore.QRect(cr.left(), cr.top(), self.line_number_area_width(), cr.height())
+            QtCore.QRect(cr.left(), cr.top(), self.line_number_width, cr.height())
         )
 
     # ====== 绘制行号 ======
     def line_number_area_paint_event(self, event):
         painter = QPainter(self.lineNumberArea)
         # 背景色
-        bg_color = QColor(self.theme["line_num_bg"])
-        painter.fillRect(event.rect(), bg_color)
+        painter.fillRect(event.rect(), self.line_num_bg_color)
         
         block = self.firstVisibleBlock()
         blockNumber = block.blockNumber()
@@ -210,25 +403,31 @@ class CodeEditor(QPlainTextEdit):
         bottom = top + round(self.blockBoundingRect(block).height())
         
         # 行号文字颜色
-        text_color = QColor(self.theme["line_num_text"])
-        painter.setPen(text_color)
+        painter.setPen(self.line_num_text_color)
         
-        while block.isValid() and top <= event.rect().bottom():
+        # 与具体行无关的尺寸在循环外算好一次（字体相关的尺寸在 refresh_font_metrics 中缓存）
+        line_height = self.line_height
+        area_width = self.lineNumberArea.width()
+        number_col_width = self.digit_advance * self.line_number_digits
+        number_x = area_width - self.fold_area_width() - number_col_width
+        fold_regions = self.fold_regions if self.folding_enabled else {}
+        symbol_widths = self.fold_symbol_widths
+        folded_starts = self.folded_starts
+        draw_text = painter.drawText
+        paint_top = event.rect().top()
+        paint_bottom = event.rect().bottom()
+        number_align = QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter
+        symbol_align = QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter
+
+        while block.isValid() and top <= paint_bottom:
             if block.isVisible():
-                if bottom >= event.rect().top():
-                    line_height = self.fontMetrics().height()
-                    fold_width = self.fold_area_width()
-                    number_col_width = self.fontMetrics().horizontalAdvance('9') * len(str(max(1, self.blockCount())))
-                    if self.folding_enabled and blockNumber in self.fold_regions:
-                        symbol = "▶" if blockNumber in self.folded_starts else "▼"
-                    number = str(blockNumber + 1)
-                    number_width = self.fontMetrics().horizontalAdvance(number)
-                    number_x = self.lineNumberArea.width() - fold_width - number_col_width
-                    if self.folding_enabled and blockNumber in self.fold_regions:
-                        symbol_width = self.fontMetrics().horizontalAdvance(symbol)
-                        symbol_x = min(self.lineNumberArea.width() - symbol_width, number_x + number_col_width + self.fold_symbol_gap)
-                        painter.drawText(symbol_x, top, symbol_width, line_height, QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter, symbol)
-                    painter.drawText(number_x, top, number_col_width, line_height, QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter, number)
+                if bottom >= paint_top:
+                    if blockNumber in fold_regions:
+                        symbol = "▶" if blockNumber in folded_starts else "▼"
+                        symbol_width = symbol_widths[symbol]
+                        symbol_x = min(area_width - symbol_width, number_x + number_col_width + self.fold_symbol_gap)
+                        draw_text(symbol_x, top, symbol_width, line_height, symbol_align, symbol)
+                    draw_text(number_x, top, number_col_width, line_height, number_align, str(blockNumber + 1))
                 
                 # 只有可见块才更新 top 和 bottom
                 top = bottom
@@ -294,6 +493,11 @@ class CodeEditor(QPlainTextEdit):
         self.update_line_number_area_width(0)
         self.rebuild_fold_regions()
 
+    def on_contents_change(self, position, chars_removed, chars_added):
+        # 只改格式时没有字符增删，不算文本修改
+        if chars_removed or chars_added:
+            self.text_modified.emit()
+
     def rebuild_fold_regions(self):
         if not self.folding_enabled:
             return
@@ -385,7 +589,7 @@ class CodeEditor(QPlainTextEdit):
                 placeholder_block = self.document().findBlockByNumber(placeholder_block_num)
                 if placeholder_block.isValid():
                     original_text = placeholder_block.text()
-                    indent = re.match(r"\s*", original_text).group(0)
+                    indent = LEADING_WHITESPACE_PATTERN.match(original_text).group(0)
                     self.set_block_text(placeholder_block_num, f"{indent}...")
                     self.fold_placeholder_blocks[start] = (placeholder_block_num, original_text)
             
@@ -476,19 +680,15 @@ class CodeEditor(QPlainTextEdit):
 
     # ====== 当前行高亮 ======
     def highlight_current_line(self):
-        extraSelections = []
-        selection = QTextEdit.ExtraSelection()
-        # 当前行背景色
-        lineColor = QColor(self.theme["current_line"])
-        selection.format.setBackground(lineColor)
-        selection.format.setProperty(QTextFormat.FullWidthSelection, True)
-        selection.cursor = self.textCursor()
-        selection.cursor.clearSelection()
-        extraSelections.append(selection)
-        
+        cursor = self.textCursor()
+        cursor.clearSelection()
+        self.current_line_selection.cursor = cursor
+        selections = [self.current_line_selection]
+        if self.search_highlighter is not None:
+            # 当前行的整行背景会盖住高亮器设置的匹配背景，当前行内的匹配改用 ExtraSelection 叠加在上面
+            selections.extend(self.search_highlighter.block_match_selections(cursor.block()))
         # 叠加搜索高亮
-        extraSelections.extend(self.search_extra_selections)
-        self.setExtraSelections(extraSelections)
+        self.setExtraSelections(selections + self.search_extra_selections)
 
     def set_search_selections(self, selections):
         """
@@ -498,36 +698,27 @@ class CodeEditor(QPlainTextEdit):
         self.highlight_current_line()
 
     # ====== 绘制 placeholder ======
+    def refresh_placeholder(self):
+        """
+        placeholder 显示状态变化时才重绘视口。
+        文字本身的重绘由 Qt 负责，已有内容时继续输入不会再触发整个视口的重绘。
+        """
+        placeholder_visible = bool(self.placeholder) and self.document().isEmpty()
+        if placeholder_visible != self.placeholder_visible:
+            self.placeholder_visible = placeholder_visible
+            self.viewport().update()
+
     def paintEvent(self, event):
         super().paintEvent(event)
-        if not self.toPlainText() and self.placeholder:
+        # 是否为空已由 refresh_placeholder 记录，不必每次重绘都取出整篇文本判断
+        if self.placeholder_visible:
             painter = QPainter(self.viewport())
             # placeholder 颜色
-            painter.setPen(QColor(self.theme["placeholder"]))
+            painter.setPen(self.placeholder_color)
             painter.drawText(self.viewport().rect().adjusted(4, 4, -4, -4),
                              Qt.AlignTop | Qt.AlignLeft,
                              self.placeholder)
 
-# ====== 行号编辑器 ======
-class LineNumberArea(QWidget):
-    """
-    显示编辑器左侧行号的 QWidget
-    """
-    def __init__(self, editor):
-        super().__init__(editor)
-        self.editor = editor
-
-    def sizeHint(self):
-        # 告诉布局管理器行号区域的宽度
-        return QtCore.QSize(self.editor.line_number_area_width(), 0)
-
-    def paintEvent(self, event):
-        # 代理绘制，由父 CodeEditor 处理
-        self.editor.line_number_area_paint_event(event)
-
-    def mousePressEvent(self, event):
-        self.editor.line_number_area_mouse_press_event(event)
-
 # ====== 支持 placeholder 的 QTreeWidget ======
 class PlaceholderTreeWidget(QTreeWidget):
     """
@@ -537,17 +728,30 @@ class PlaceholderTreeWidget(QTreeWidget):
         super().__init__(*args, **kwargs)
         self.placeholder = placeholder
         self.theme = THEMES["light"]
-        # 数据变化时刷新绘制 placeholder
-        self.model().rowsInserted.connect(self.refresh_placeholder)
-        self.model().rowsRemoved.connect(self.refresh_placeholder)
-        self.model().modelReset.connect(self.refresh_placeholder)
-
-    def refresh_placeholder(self, *args):
-        """刷新 placeholder 显示"""
-        self.viewport().update()
+        self.placeholder_color = QColor(self.theme["placeholder"])
+        self.placeholder_visible = bool(self.placeholder)
+        # 数据变化时刷新 placeholder：同一轮事件循环内的多次增删行只检查一次
+        self.placeholder_timer = QtCore.QTimer(self)
+        self.placeholder_timer.setSingleShot(True)
+        self.placeholder_timer.setInterval(0)
+        self.placeholder_timer.timeout.connect(self.refresh_placeholder)
+        self.model().rowsInserted.connect(self.placeholder_timer.start)
+        self.model().rowsRemoved.connect(self.placeholder_timer.start)
+        self.model().modelReset.connect(self.placeholder_timer.start)
+
+    def refresh_placeholder(self):
+        """
+        placeholder 显示状态变化时才重绘视口，
+        树中已有内容时的增删行由 Qt 自己重绘
+        """
+        placeholder_visible = bool(self.placeholder) and self.topLevelItemCount() == 0
+        if placeholder_visible != self.placeholder_visible:
+            self.placeholder_visible = placeholder_visible
+            self.viewport().update()
 
     def set_theme(self, theme_config):
         self.theme = theme_config
+        self.placeholder_color = QColor(self.theme["placeholder"])
         self.setStyleSheet(f"""
             QTreeWidget {{
                 background-color: {self.theme['tree_bg']};
@@ -565,10 +769,10 @@ class PlaceholderTreeWidget(QTreeWidget):
 
     def paintEvent(self, event):
         super().paintEvent(event)
-        if self.topLevelItemCount() == 0 and self.placeholder:
+        if self.placeholder_visible:
             painter = QPainter(self.viewport())
             # placeholder 颜色
-            painter.setPen(QColor(self.theme["placeholder"]))
+            painter.setPen(self.placeholder_color)
             painter.drawText(self.viewport().rect().adjusted(4, 4, -4, -4),
                              Qt.AlignTop | Qt.AlignLeft,
                              self.placeholder)
@@ -748,6 +952,8 @@ class SearchHighlightDelegate(QStyledItemDelegate):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.keyword = ""
+        self.pattern = None  # 关键字对应的正则，只在关键字变化时编译一次
+        self.text_color = TREE_TEXT_COLOR.name()
         self.theme = THEMES["light"]
         self.current_item = None
         self.current_match_index = -1
@@ -757,6 +963,7 @@ class SearchHighlightDelegate(QStyledItemDelegate):
 
     def set_search_config(self, keyword, theme):
         self.keyword = keyword
+        self.pattern = re.compile(re.escape(keyword), re.IGNORECASE) if keyword else None
         self.theme = theme
         self.current_item = None
         self.current_match_index = -1
@@ -782,8 +989,6 @@ class SearchHighlightDelegate(QStyledItemDelegate):
         if not text:
             return
 
-        import html
-        
         # 获取当前 item (用于判断是否是当前匹配项)
         current_item_widget = None
         tree_widget = None
@@ -799,12 +1004,10 @@ class SearchHighlightDelegate(QStyledItemDelegate):
         # 准备 HTML
         html_content = html.escape(text)
 
-        if self.keyword:
-            import re
+        if self.pattern is not None:
             try:
                 # 在原始文本中查找匹配
-                pattern = re.compile(re.escape(self.keyword), re.IGNORECASE)
-                matches = list(pattern.finditer(text))
+                matches = list(self.pattern.finditer(text))
                 
                 if matches:
                     html_parts = []
@@ -851,11 +1054,11 @@ class SearchHighlightDelegate(QStyledItemDelegate):
         # 使用缓存的 QTextDocument 渲染 HTML
         self._doc.setDefaultFont(options.font)
         
-        # 确定文字颜色
+        # 确定文字颜色：未选中的节点统一使用树的文字颜色，无需给每个节点单独设置前景色
         if options.state & QStyle.State_Selected:
             text_color = options.palette.color(QPalette.HighlightedText).name()
         else:
-            text_color = options.palette.color(QPalette.Text).name()
+            text_color = self.text_color
             
         self._doc.setTextWidth(text_rect.width())
         # white-space: pre 保持空格
@@ -873,8 +1076,30 @@ class SearchHighlightDelegate(QStyledItemDelegate):
         painter.restore()
 
 
+# ====== 后台解析任务 ======
+class JsonParseWorker(QtCore.QRunnable):
+    """
+    在线程池中解析、格式化 JSON（只做数据计算，不碰任何控件），
+    完成后通过窗口的 json_parsed 信号把结果送回主线程更新界面
+    """
+
+    def __init__(self, window, generation, text, skip_fingerprint=None):
+        super().__init__()
+        self.window = window
+        self.generation = generation  # 发起时的解析代数，主线程据此丢弃过期结果
+        self.text = text
+        self.skip_fingerprint = skip_fingerprint
+
+    def run(self):
+        result = self.window.compute_json_result(self.text, self.skip_fingerprint, self.generation)
+        # 跨线程发射信号，槽函数会排队到主线程执行
+        self.window.json_parsed.emit(self.generation, result)
+
+
 # ====== JSON 格式化窗口 ======
 class JsonFormatterWindow(QWidget):
+    json_parsed = QtCore.Signal(int, object)  # 后台解析完成：(解析代数, 解析结果)
+
     windows = []         # 所有窗口实例
     tool_windows = []    # 其他工具窗口实例
     window_count = 0     # 窗口计数，用于区分标题
@@ -898,7 +1123,20 @@ class JsonFormatterWindow(QWidget):
         # ====== 输入编辑器 ======
         self.input_edit = CodeEditor(placeholder="原始 JSON")
         self.input_edit.setFont(font)
-        self.input_edit.textChanged.connect(self.auto_format_input)  # 自动格式化 JSON
+        # 自动格式化 JSON：输入停顿后才解析，连续按键只触发一次完整解析
+        self.auto_format_timer = QtCore.QTimer(self)
+        self.auto_format_timer.setSingleShot(True)
+        self.auto_format_timer.setInterval(150)
+        self.auto_format_timer.timeout.connect(self.auto_format_input)
+        self.input_edit.text_modified.connect(self.schedule_auto_format)
+        # 输入框没有语法高亮，只用于标出搜索匹配
+        self.input_highlighter = SearchHighlighter(self.input_edit.document())
+        self.input_edit.search_highlighter = self.input_highlighter
+        # 自动格式化在后台线程解析，每次发起解析代数 +1，只采用最新一次的结果
+        self.parse_generation = 0
+        self.parse_pending_text = None  # 正在后台解析的输入文本
+        self.last_auto_parsed = (None, None)  # 上次自动解析的 (输入文本, 对应的结果文本)
+        self.json_parsed.connect(self.on_json_parsed)
 
         # ====== 输出树 ======
         self.output_tree = PlaceholderTreeWidget(
@@ -906,7 +1144,11 @@ class JsonFormatterWindow(QWidget):
         )
         self.output_tree.setHeaderHidden(True)
         self.output_tree.setFont(font)
+        # 每行都是单行文本、行高一致，让视图不必逐行计算高度
+        self.output_tree.setUniformRowHeights(True)
         self.output_tree.itemClicked.connect(self.on_tree_item_clicked)
+        # 子节点在首次展开时才创建
+        self.output_tree.itemExpanded.connect(self.load_tree_item_children)
         # 设置搜索高亮代理
         self.search_delegate = SearchHighlightDelegate(self.output_tree)
         self.output_tree.setItemDelegate(self.search_delegate)
@@ -917,11 +1159,19 @@ class JsonFormatterWindow(QWidget):
         # ====== 输出文本 ======
         self.output_edit = CodeEditor(placeholder="JSON 结果（格式化输出）")
         self.output_edit.setPlaceholderText("JSON 结果（格式化输出）")  # CodeEditor 也支持这个
-        # 添加 JSON 高亮器
+        # 添加 JSON 高亮器（同时负责标出搜索匹配）
         self.highlighter = JsonHighlighter(self.output_edit.document())
+        self.output_edit.search_highlighter = self.highlighter
         self.output_edit.setFont(font)
         self.output_edit.setReadOnly(True)
+        # 结果区只读，折叠占位行的替换不需要进撤销栈（大文档折叠时撤销栈会保留被替换的整行文本）
+        self.output_edit.setUndoRedoEnabled(False)
         self.output_edit.enable_json_folding(True)
+        self.output_text = ""  # 右侧当前显示的文本
+        self.tree_fingerprint = None  # 当前树对应数据的结构指纹，用于判断是否需要重建树
+        self.formatted_result = (None, None)  # 上次格式化的 (结构指纹, 结果文本)
+        self.parsed_input = (None, None)  # 上次成功解析的 (输入文本, 结构指纹)，按钮操作同一输入时免去重新解析
+        self.plain_string_cache = set()  # 解析嵌套 JSON 时已确认不是 JSON 的字符串
         palette = self.output_edit.palette()
         palette.setColor(QPalette.PlaceholderText, QColor("#999999"))  # placeholder 灰色
         self.output_edit.setPalette(palette)
@@ -1288,6 +1538,7 @@ class JsonFormatterWindow(QWidget):
             
             # 更新高亮器颜色
             self.highlighter.set_theme(theme)
+            self.input_highlighter.set_theme(theme)
             
             # 5. 设置可折叠面板主题
             self.left_panel.set_theme(theme)
@@ -1367,6 +1618,13 @@ class JsonFormatterWindow(QWidget):
         candidate = value.strip()
         if len(candidate) >= 2 and candidate[0] == '`' and candidate[-1] == '`':
             candidate = candidate[1:-1].strip()
+        # 只有以 { [ " 开头的字符串才可能是嵌套 JSON，其余字符串直接跳过，
+        # 避免对大量普通字段做一次必然失败的解析（异常处理开销很大）
+        if candidate[:1] not in ('{', '[', '"'):
+            return value
+        # 之前已确认无法解析的字符串（同一文档里重复出现、或每次输入变化后未改动的字段）直接跳过
+        if candidate in self.plain_string_cache:
+            return value
         attempts = [candidate]
         if '\\"' in candidate:
             attempts.append(candidate.replace('\\"', '"'))
@@ -1374,8 +1632,9 @@ class JsonFormatterWindow(QWidget):
             current = attempt
             for _ in range(3):
                 try:
-                    parsed = json.loads(current)
-                except Exception:
+                    parsed = json_loads(current)
+                except (ValueError, RecursionError):
+                    # 只吞掉解析失败（JSONDecodeError 是 ValueError 的子类）和嵌套过深，其余异常照常抛出
                     break
                 if isinstance(parsed, str):
                     next_current = parsed.strip()
@@ -1384,185 +1643,299 @@ class JsonFormatterWindow(QWidget):
                     current = next_current
                     continue
                 return parsed
+        # 解析成功的结果是可变的 dict/list，不能共享缓存，只记住解析失败的字符串
+        if len(self.plain_string_cache) >= PLAIN_STRING_CACHE_SIZE:
+            self.plain_string_cache.clear()
+        self.plain_string_cache.add(candidate)
         return value
 
-    def parse_nested_json_object(self, obj):
-        if isinstance(obj, dict):
-            for k, v in list(obj.items()):
-                parsed_v = self.parse_nested_json_value(v)
-                obj[k] = parsed_v
-                if isinstance(parsed_v, (dict, list)):
-                    self.parse_nested_json_object(parsed_v)
-        elif isinstance(obj, list):
-            for i, v in enumerate(list(obj)):
-                parsed_v = self.parse_nested_json_value(v)
-                obj[i] = parsed_v
-                if isinstance(parsed_v, (dict, list)):
-                    self.parse_nested_json_object(parsed_v)
+    def parse_nested_json_object(self, obj, generation=None):
+        # 使用显式栈代替递归遍历，层级很深的 JSON 也不会触发 RecursionError
+        stack = [obj]
+        while stack:
+            # 后台解析已被更新的输入作废时提前结束，调用方用 parse_cancelled 判断
+            if generation is not None and generation != self.parse_generation:
+                break
+            node = stack.pop()
+            if isinstance(node, dict):
+                entries = list(node.items())
+            elif isinstance(node, list):
+                entries = list(enumerate(node))
+            else:
+                continue
+            for k, v in entries:
+                if isinstance(v, str):
+                    parsed = self.parse_nested_json_value(v)
+                    if parsed is v:
+                        continue
+                    node[k] = v = parsed
+                # 新解析出的值也入栈，继续展开其中的嵌套 JSON 字符串，每个节点只遍历一次
+                if isinstance(v, (dict, list)):
+                    stack.append(v)
         return obj
 
+    # ====== 结果区更新 ======
+    def set_output_text(self, text):
+        """
+        更新右侧 JSON 结果。
+        内容与当前显示的一致时（例如只修改了输入中的空白）直接跳过，
+        省去整篇文档的重新布局、高亮和折叠区域计算。
+        setPlainText 会让高亮器自动重新高亮变化的文本块，无需再整篇 rehighlight。
+        """
+        if text == self.output_text:
+            return
+        self.output_text = text
+        self.output_edit.setPlainText(text)
+
+    def update_tree(self, data, fingerprint=None):
+        """
+        更新中间的 JSON 树。
+        fingerprint 是原始解析结果的紧凑序列化文本，与当前树的一致时说明结构没有变化，跳过重建。
+        """
+        if fingerprint is not None and fingerprint == self.tree_fingerprint:
+            return
+        self.populate_tree(data)
+        self.tree_fingerprint = fingerprint
+
+    def clear_results(self):
+        self.output_tree.clear()
+        self.search_panels["tree"].mark_matches_stale()
+        self.tree_fingerprint = None
+        self.set_output_text("")
+
     def process_json(self, text: str, show_error_dialog=True):
         """
-        核心：格式化并渲染 JSON。
+        核心：格式化并渲染 JSON（在主线程同步执行）。
         支持字段值为 JSON 字符串的情况。
         :param text: 原始 JSON 文本
         :param show_error_dialog: 是否显示错误弹窗（自动模式下不弹）
         """
-        if not text:
-            self.output_tree.clear()
-            self.output_edit.setPlainText("")
-            self.highlighter.rehighlight()
+        # 作废仍在后台解析的旧结果，避免晚到的结果覆盖本次结果
+        self.parse_generation += 1
+        if not text or text.isspace():
+            self.clear_results()
+            return
+        # 输入刚被自动格式化成功解析过、右侧仍是那次的结果（如输入停顿后再点“格式化”）时无需再解析
+        if text == self.parsed_input[0] and self.unchanged_fingerprint() == self.parsed_input[1]:
             return
+        result = self.compute_json_result(text, self.unchanged_fingerprint())
+        self.apply_json_result(result, show_error_dialog)
+        self.remember_parsed_input(text, result)
 
-        try:
-            data = json.loads(text)
-            data = self.parse_nested_json_object(data)
+    def remember_parsed_input(self, text, result):
+        """
+        解析成功（或结构未变）时记下输入文本与结构指纹，供格式化、压缩同一输入时复用
+        """
+        if result[0] in ("ok", "unchanged"):
+            self.parsed_input = (text, self.formatted_result[0])
+
+    def unchanged_fingerprint(self):
+        """
+        右侧仍显示上次格式化结果时返回其结构指纹，否则返回 None
+        """
+        last_fingerprint, last_text = self.formatted_result
+        return last_fingerprint if self.output_text is last_text else None
 
-            # 更新树与右侧结果
-            self.populate_tree(data)
-            json_text = json.dumps(data, indent=4, ensure_ascii=False)
-            self.output_edit.setPlainText(json_text)
-            self.highlighter.rehighlight()  # 🔹 确保高亮
+    def parse_cancelled(self, generation):
+        """
+        后台解析发起后输入又有变化（解析代数已更新）时返回 True，剩下的计算不必再做
+        """
+        return generation is not None and generation != self.parse_generation
 
+    def compute_json_result(self, text, skip_fingerprint=None, generation=None):
+        """
+        解析并格式化 JSON，只做数据计算、不访问任何控件，可以在后台线程执行。
+        传入 generation 时，每个耗时步骤之间检查一次是否已被作废，作废则提前返回。
+        返回元组，交给 apply_json_result 在主线程更新界面：
+          ("cancelled",)                                      已被更新的解析作废，结果不会被采用
+          ("unchanged",)                                      结构与 skip_fingerprint 相同，无需更新
+          ("ok", 结构指纹, 数据, 格式化文本)
+          ("extracted", 结构指纹, 数据, 结果文本, 原始解析错误)  从混合文本中提取出了 JSON
+          ("error", 解析错误)
+        """
+        try:
+            data = json_loads_stripped(text)
         except json.JSONDecodeError as e:
-            # 自动触发 或 手动触发
+            # extract_json_from_text 返回的是去掉首尾空白后的下标，拼接前后内容时要用同样的文本
+            text = text.strip()
             # 尝试查找并提取混合内容中的 JSON
             extracted_json, start_idx, end_idx = self.extract_json_from_text(text)
             if extracted_json:
                 try:
                     # 解析提取出的 JSON
-                    data = json.loads(extracted_json)
-                    data = self.parse_nested_json_object(data)
-                    
-                    # 更新树
-                    self.populate_tree(data)
-                    
+                    data = json_loads(extracted_json)
+                    if self.parse_cancelled(generation):
+                        return ("cancelled",)
+                    fingerprint = json_dumps_compact(data)
+                    data = self.parse_nested_json_object(data, generation)
+                    if self.parse_cancelled(generation):
+                        return ("cancelled",)
+
                     # 格式化 JSON
-                    formatted_json = json.dumps(data, indent=4, ensure_ascii=False)
-                    
+                    formatted_json = json_dumps_indent(data)
+
                     # 拼接到原文中（保留前后非 JSON 内容）
                     prefix = text[:start_idx]
                     suffix = text[end_idx:]
-                    
+
                     # 构造错误提示信息
                     error_msg = f"// ⚠️ 解析警告：第 {e.lineno} 行解析错误，原因：{e.msg}\n"
-                    
+
                     final_text = f"{error_msg}{prefix}{formatted_json}{suffix}"
-                    
-                    self.output_edit.setPlainText(final_text)
-                    self.highlighter.rehighlight()
-                    
-                    # 弹出警告提示（如果是自动触发，就不弹窗干扰了，改用状态栏或其他方式提示更好）
-                    if show_error_dialog:
-                        msg_info = (f"虽然提取并格式化了其中的 JSON 内容，\n"
-                                    f"但输入的文本包含非 JSON 字符，请检查原始数据。\n\n"
-                                    f"原始解析错误:\n{e.msg}\n行: {e.lineno}, 列: {e.colno}")
-                        QMessageBox.warning(self, "JSON 格式有误", msg_info)
-                    else:
-                        pass
-                    return
+                    return ("extracted", fingerprint, data, final_text, e)
 
                 except Exception as inner_e:
                     pass # 提取后的解析还是失败，继续显示原来的错误
+            return ("error", e)
+
+        # 用紧凑序列化结果作为结构指纹：与上次相同（如只改了空白）且右侧仍显示上次的结果时，
+        # 树和结果都已是最新，连嵌套解析和格式化都可以省掉
+        if self.parse_cancelled(generation):
+            return ("cancelled",)
+        fingerprint = json_dumps_compact(data)
+        if fingerprint == skip_fingerprint:
+            return ("unchanged",)
+        data = self.parse_nested_json_object(data, generation)
+        if self.parse_cancelled(generation):
+            return ("cancelled",)
+        return ("ok", fingerprint, data, json_dumps_indent(data))
+
+    def apply_json_result(self, result, show_error_dialog=True):
+        """
+        在主线程把 compute_json_result 的结果更新到树与右侧结果
+        """
+        kind = result[0]
+        if kind == "ok":
+            _, fingerprint, data, json_text = result
+            self.update_tree(data, fingerprint)
+            self.set_output_text(json_text)
+            self.formatted_result = (fingerprint, self.output_text)
+
+        elif kind == "extracted":
+            _, fingerprint, data, final_text, e = result
+            self.update_tree(data, fingerprint)
+            self.set_output_text(final_text)
+
+            # 弹出警告提示（如果是自动触发，就不弹窗干扰了）
+            if show_error_dialog:
+                msg_info = (f"虽然提取并格式化了其中的 JSON 内容，\n"
+                            f"但输入的文本包含非 JSON 字符，请检查原始数据。\n\n"
+                            f"原始解析错误:\n{e.msg}\n行: {e.lineno}, 列: {e.colno}")
+                QMessageBox.warning(self, "JSON 格式有误", msg_info)
 
+        elif kind == "error":
+            e = result[1]
             # 只有在手动触发时，才弹出错误对话框
             if show_error_dialog:
                 QMessageBox.critical(self, "格式化失败", f"{e.msg}\n行: {e.lineno}, 列: {e.colno}")
             else:
-                self.output_tree.clear()
-                self.output_edit.setPlainText("")
-                self.highlighter.rehighlight()
+                self.clear_results()
+
+    def on_json_parsed(self, generation, result):
+        """
+        后台解析完成（主线程）：只采用最新一次发起的解析结果
+        """
+        if generation != self.parse_generation:
+            return
+        self.apply_json_result(result, show_error_dialog=False)
+        self.remember_parsed_input(self.parse_pending_text, result)
+        self.last_auto_parsed = (self.parse_pending_text, self.output_text)
 
     def extract_json_from_text(self, text):
         """
         尝试从文本中提取第一个有效的 JSON 对象或数组
         返回: (json_str, start_index, end_index)
+        输入中途出错时每次自动格式化都会走到这里，扫描交给正则整段跳过字符串内容，
+        Python 循环只处理括号和字符串两类记号，不再逐字符判断
         """
         text = text.strip()
         
         # 1. 寻找第一个 { 或 [
-        start_idx = -1
-        for i, char in enumerate(text):
-            if char in '{[':
-                start_idx = i
-                break
-                
-        if start_idx == -1:
+        first_match = JSON_OPEN_BRACKET_PATTERN.search(text)
+        if first_match is None:
             return None, -1, -1
+        start_idx = first_match.start()
             
-        # 2. 从 start_idx 开始匹配括号
+        # 2. 从 start_idx 开始匹配括号（字符串内的括号不计）
         stack = []
-        in_string = False
-        escape = False
-        
-        for i in range(start_idx, len(text)):
-            char = text[i]
-            
-            if in_string:
-                if escape:
-                    escape = False
-                elif char == '\\':
-                    escape = True
-                elif char == '"':
-                    in_string = False
-            else:
-                if char == '"':
-                    in_string = True
-                elif char in '{[':
-                    stack.append(char)
-                elif char in '}]':
+        for match in JSON_STRUCTURE_PATTERN.finditer(text, start_idx):
+            char = match.group()
+            if char in '{[':
+                stack.append(char)
+            elif char in '}]':
+                if not stack:
+                    # 只有右括号没有左括号，说明匹配失败（可能是多余的符号）
+                    continue
+
+                last = stack[-1]
+                if (char == '}' and last == '{') or (char == ']' and last == '['):
+                    stack.pop()
+                    # 如果栈空了，说明找到了一个完整的闭合 JSON 对象
                     if not stack:
-                        # 只有右括号没有左括号，说明匹配失败（可能是多余的符号）
-                        continue 
-                    
-                    last = stack[-1]
-                    if (char == '}' and last == '{') or (char == ']' and last == '['):
-                        stack.pop()
-                        # 如果栈空了，说明找到了一个完整的闭合 JSON 对象
-                        if not stack:
-                            # 截取候选 JSON
-                            candidate = text[start_idx : i+1]
-                            # 尝试验证解析
-                            try:
-                                json.loads(candidate)
-                                return candidate, start_idx, i+1
-                            except:
-                                # 解析失败，继续寻找（可能只是碰巧匹配了括号但内容不对）
-                                pass
+                        # 截取候选 JSON
+                        end_idx = match.end()
+                        candidate = text[start_idx:end_idx]
+                        # 尝试验证解析
+                        try:
+                            json_loads(candidate)
+                            return candidate, start_idx, end_idx
+                        except (ValueError, RecursionError):
+                            # 解析失败，继续寻找（可能只是碰巧匹配了括号但内容不对）
+                            pass
         
         return None, -1, -1
 
     # ====== 自动格式化输入 JSON ======
+    def schedule_auto_format(self):
+        # 定时器运行中再次 start 会重新计时，从而把一串连续编辑合并成一次解析
+        self.auto_format_timer.start()
+
     def auto_format_input(self):
         """
-        自动格式化：实时解析输入（不弹窗提示错误）
+        自动格式化：实时解析输入（不弹窗提示错误）。
+        解析放到后台线程执行，大文档也不会卡住界面；输入再次变化时旧的结果会被丢弃
         """
-        text = self.input_edit.toPlainText().strip()
-        self.process_json(text, show_error_dialog=False)
+        self.start_background_parse(self.input_edit.toPlainText())
+
+    def start_background_parse(self, text):
+        """
+        在后台线程解析 text，完成后由 on_json_parsed 更新界面
+        """
+        self.parse_generation += 1
+        if not text or text.isspace():
+            self.clear_results()
+            return
+        # 输入与上次自动解析的相同（如撤销回原文本、打开同一文件），且右侧仍是那次的结果时无需再解析
+        last_text, last_output = self.last_auto_parsed
+        if text == last_text and self.output_text is last_output:
+            return
+        self.parse_pending_text = text
+        worker = JsonParseWorker(self, self.parse_generation, text, self.unchanged_fingerprint())
+        QtCore.QThreadPool.globalInstance().start(worker)
 
     # ====== 点击“格式化”按钮 ======
     def format_json(self):
         """
         按钮触发格式化：会显示错误提示框
         """
-        text = self.input_edit.toPlainText().strip()
+        # 取消尚未触发的防抖自动格式化，免得它稍后覆盖本次结果
+        self.auto_format_timer.stop()
+        text = self.input_edit.toPlainText()
         self.process_json(text, show_error_dialog=True)
 
     def normalize_loose_json_text(self, text: str) -> str:
         normalized = text.strip()
-        fence_pattern = r'^\s*```(?:json)?\s*([\s\S]*?)\s*```\s*$'
-        fence_match = re.match(fence_pattern, normalized, flags=re.IGNORECASE)
+        fence_match = CODE_FENCE_PATTERN.match(normalized)
         if fence_match:
             normalized = fence_match.group(1)
 
         normalized = normalized.replace('\u00a0', ' ')
-        normalized = re.sub(r'\\\s*$', '', normalized)
+        normalized = TRAILING_BACKSLASH_PATTERN.sub('', normalized)
 
-        if re.match(r'^\s*[\{\[]\\"', normalized):
-            normalized = re.sub(r'(?<!\\)\\"', '"', normalized)
+        if ESCAPED_JSON_START_PATTERN.match(normalized):
+            normalized = ESCAPED_QUOTE_PATTERN.sub('"', normalized)
 
-        normalized = re.sub(
-            r'`([^`\\]*(?:\\.[^`\\]*)*)`',
+        normalized = BACKTICK_STRING_PATTERN.sub(
             lambda m: json.dumps(m.group(1), ensure_ascii=False),
             normalized
         )
@@ -1570,7 +1943,7 @@ class JsonFormatterWindow(QWidget):
         previous = None
         while previous != normalized:
             previous = normalized
-            normalized = re.sub(r',(\s*[}\]])', r'\1', normalized)
+            normalized = TRAILING_COMMA_PATTERN.sub(r'\1', normalized)
 
         return normalized
 
@@ -1598,7 +1971,7 @@ class JsonFormatterWindow(QWidget):
         completed = text
         if in_string:
             if completed.endswith('\\'):
-                completed = re.sub(r'\\+$', '', completed)
+                completed = TRAILING_BACKSLASHES_PATTERN.sub('', completed)
             completed += '"'
         for token in reversed(stack):
             completed += '}' if token == '{' else ']'
@@ -1608,7 +1981,7 @@ class JsonFormatterWindow(QWidget):
         candidate = text
         for _ in range(3):
             try:
-                json.loads(candidate)
+                json_loads(candidate)
                 return candidate
             except json.JSONDecodeError as e:
                 if "Unterminated string" in e.msg or "Expecting ',' delimiter" in e.msg:
@@ -1621,6 +1994,8 @@ class JsonFormatterWindow(QWidget):
         return candidate
 
     def loose_parse_json(self):
+        # 取消尚未触发的防抖自动格式化，免得它稍后用未修复的输入覆盖本次结果
+        self.auto_format_timer.stop()
         text = self.input_edit.toPlainText().strip()
         normalized = self.normalize_loose_json_text(text)
         normalized = self.try_repair_loose_json_text(normalized)
@@ -1643,48 +2018,136 @@ class JsonFormatterWindow(QWidget):
         JsonFormatterWindow.tool_windows.append(win)
 
     # ====== 构建树 ======
-    def populate_tree(self, data, parent=None, key_name=None):
+    def populate_tree(self, data):
         """
-        将 JSON 数据转换为 QTreeWidgetItem 树形结构
+        将 JSON 数据转换为 QTreeWidgetItem 树形结构。
+        采用懒加载：只创建根节点及其直接子节点，更深层的容器节点先挂一个占位子节点，
+        等用户展开时再创建真正的子节点，大文档也只需构建可见部分。
         """
-        if parent is None:
-            self.output_tree.clear()
-            parent = self.output_tree
-
-        # 设置中间树的文字颜色
-        color = QColor("#62b37a")
+        tree = self.output_tree
+        tree.setUpdatesEnabled(False)
+        tree.blockSignals(True)
+        try:
+            tree.clear()
+            root = self.create_tree_item(None, data)
+            tree.addTopLevelItem(root)
+            self.load_tree_item_children(root)
+            root.setExpanded(True)
+        finally:
+            tree.blockSignals(False)
+            tree.setUpdatesEnabled(True)
+        # 树搜索记录的节点路径对应旧树，跳转前需要重新查找
+        self.search_panels["tree"].mark_matches_stale()
 
-        if isinstance(data, dict):
-            item = QTreeWidgetItem([key_name] if key_name else "")
-            item.setForeground(0, color)  # 设置文字颜色
-            if parent is self.output_tree:
-                parent.addTopLevelItem(item)
-            else:
-                parent.addChild(item)
-            item.setExpanded(True)
-            for k, v in data.items():
-                self.populate_tree(v, item, k)
-
-        elif isinstance(data, list):
-            item = QTreeWidgetItem([key_name] if key_name else "")
-            item.setForeground(0, color)  # 设置文字颜色
-            if parent is self.output_tree:
-                parent.addTopLevelItem(item)
-            else:
-                parent.addChild(item)
-            item.setExpanded(True)
-            for i, v in enumerate(data):
-                self.populate_tree(v, item, f"[{i}]")
+    def create_tree_item(self, key_name, data):
+        """
+        创建单个树节点（不挂载到父节点）。
+        每个节点都在 UserRole 中保存 (key, 原始数据)：PySide 对 tuple 只保存对象引用，
+        所有节点共享同一份解析结果，不会像 dict/list 那样被深拷贝成 QVariant，
+        叶子节点也不必再单独序列化一份 JSON 文本。
+        非空容器先挂一个占位子节点以显示展开箭头。
+        """
+        text = tree_item_text(key_name, data)
+        if isinstance(data, (dict, list)):
+            item = QTreeWidgetItem([text] if text else [])
+            if data:
+                item.setData(0, TREE_LAZY_ROLE, True)
+                item.addChild(QTreeWidgetItem([TREE_LAZY_PLACEHOLDER]))
         else:
-            text = f"{key_name}: {data}" if key_name else str(data)
             item = QTreeWidgetItem([text])
-            item.setForeground(0, color)  # 设置文字颜色
-            if parent is self.output_tree:
-                parent.addTopLevelItem(item)
-            else:
-                parent.addChild(item)
-            item.setData(0, QtCore.Qt.UserRole, json.dumps({"k": key_name, "v": data}, ensure_ascii=False))
             item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicator)
+        item.setData(0, QtCore.Qt.UserRole, (key_name, data))
+        return item
+
+    def load_tree_item_children(self, item):
+        """
+        为懒加载的容器节点创建真正的子节点（替换占位子节点）
+        """
+        if not item.data(0, TREE_LAZY_ROLE):
+            return
+        item.setData(0, TREE_LAZY_ROLE, False)
+        _, data = item.data(0, QtCore.Qt.UserRole)
+        first_index = item.data(0, TREE_PAGE_ROLE) or 0
+        if len(data) > TREE_PAGE_SIZE:
+            children = self.create_tree_page_items(data)
+        else:
+            children = [self.create_tree_item(key, value)
+                        for key, value in tree_child_entries(data, first_index)]
+        item.takeChildren()
+        item.addChildren(children)
+
+    def create_tree_page_items(self, data):
+        """
+        超大容器的子节点按 TREE_PAGE_SIZE 分页，每页是一个懒加载节点，
+        UserRole 中保存该页的数据切片（点击可查看该页的 JSON）
+        """
+        pages = []
+        for start, end, page in tree_page_slices(data):
+            item = QTreeWidgetItem([f"[{start} … {end - 1}]"])
+            item.setData(0, TREE_LAZY_ROLE, True)
+            item.setData(0, TREE_PAGE_ROLE, start)
+            item.setData(0, QtCore.Qt.UserRole, (None, page))
+            item.addChild(QTreeWidgetItem([TREE_LAZY_PLACEHOLDER]))
+            pages.append(item)
+        return pages
+
+    def load_all_tree_items(self):
+        """
+        加载全部懒加载节点（全部展开等需要完整树的操作使用）
+        """
+        tree = self.output_tree
+        tree.setUpdatesEnabled(False)
+        try:
+            stack = [tree.topLevelItem(i) for i in range(tree.topLevelItemCount())]
+            while stack:
+                item = stack.pop()
+                self.load_tree_item_children(item)
+                stack.extend(item.child(i) for i in range(item.childCount()))
+        finally:
+            tree.setUpdatesEnabled(True)
+
+    def iter_tree_item_texts(self):
+        """
+        按树的先序遍历顺序产出 (节点路径, 节点文字)，不创建任何节点。
+        节点路径是从顶层节点开始逐级的子节点行号，可交给 tree_item_at 找到（并按需创建）对应节点。
+        搜索只需要节点文字，直接在数据上遍历，不必为整棵树创建 QTreeWidgetItem。
+        """
+        tree = self.output_tree
+        stack = []
+        for row in reversed(range(tree.topLevelItemCount())):
+            key_name, data = tree.topLevelItem(row).data(0, Qt.UserRole)
+            stack.append(((row,), tree_item_text(key_name, data), data, 0))
+        while stack:
+            path, text, data, first_index = stack.pop()
+            yield path, text
+            if not isinstance(data, (dict, list)):
+                continue
+            if len(data) > TREE_PAGE_SIZE:
+                children = [(f"[{start} … {end - 1}]", page, start)
+                            for start, end, page in tree_page_slices(data)]
+            else:
+                children = [(tree_item_text(key, value), value, 0)
+                            for key, value in tree_child_entries(data, first_index)]
+            for row in reversed(range(len(children))):
+                text, value, start = children[row]
+                stack.append((path + (row,), text, value, start))
+
+    def tree_item_at(self, path):
+        """
+        按 iter_tree_item_texts 给出的路径找到节点，沿途的懒加载节点按需创建子节点。
+        路径在当前树中不存在时返回 None
+        """
+        item = self.output_tree.topLevelItem(path[0])
+        for row in path[1:]:
+            if item is None:
+                return None
+            self.load_tree_item_children(item)
+            item = item.child(row)
+        return item
+
+    def expand_all_tree_items(self):
+        self.load_all_tree_items()
+        self.output_tree.expandAll()
 
     # ====== 点击树节点显示对应 JSON ======
     def on_tree_item_clicked(self, item, column):
@@ -1692,58 +2155,21 @@ class JsonFormatterWindow(QWidget):
         点击树节点时，在右侧显示对应 JSON，并高亮 key。
         """
 
-        def item_to_json(it):
-            """
-            递归从树节点生成 JSON 数据。
-            """
-            child_count = it.childCount()
-            # 叶子节点
-            if child_count == 0:
-                # 叶子节点直接取 UserRole 数据
-                data = it.data(0, Qt.UserRole)
-                if isinstance(data, str):
-                    try:
-                        payload = json.loads(data)
-                    except Exception:
-                        payload = None
-                    if isinstance(payload, dict) and "k" in payload and "v" in payload:
-                        key, value = payload["k"], payload["v"]
-                        return {key: value} if key else value
-                if isinstance(data, tuple) and len(data) == 2:
-                    key, value = data
-                    return {key: value} if key else value
-                else:
-                    return data
-            # 非叶子节点
-            else:
-                # 判断是否列表节点
-                is_list = all(it.child(i).text(0).startswith('[') for i in range(child_count))
-                if is_list:
-                    return [item_to_json(it.child(i)) for i in range(child_count)]
-                else:
-                    result = {}
-                    for i in range(child_count):
-                        child = it.child(i)
-                        key = child.text(0).split(":", 1)[0] if ":" in child.text(0) else child.text(0)
-                        value = item_to_json(child)
-                        # 如果 value 已经是 dict 包裹，则展开
-                        if isinstance(value, dict) and len(value) == 1 and list(value.keys())[0] == key:
-                            value = list(value.values())[0]
-                        result[key] = value
-                    return result
-
-        try:
-            # 生成 JSON 数据
-            node_data = item_to_json(item)
-            json_text = json.dumps(node_data, indent=4, ensure_ascii=False)
-            self.output_edit.setPlainText(json_text)
-            # 🔹 确保高亮显示
-            self.highlighter.rehighlight()
-
-        except Exception:
-            # 万一出错就直接显示文本
-            self.output_edit.setPlainText(item.text(0))
-            self.highlighter.rehighlight()
+        data = item.data(0, Qt.UserRole)
+        if not isinstance(data, tuple):
+            # 没有关联数据的节点（如占位节点）直接显示文本
+            self.set_output_text(item.text(0))
+            return
+        # 同一节点的格式化结果缓存在节点上，重建树时随旧节点一起丢弃
+        json_text = item.data(0, TREE_JSON_ROLE)
+        if json_text is None:
+            # 直接序列化节点保存的原始数据：容器显示其值，叶子节点带上 key 一起显示
+            key, value = data
+            if key and not isinstance(value, (dict, list)):
+                value = {key: value}
+            json_text = json_dumps_indent(value)
+            item.setData(0, TREE_JSON_ROLE, json_text)
+        self.set_output_text(json_text)
 
     # ====== 右键菜单 ======
     def open_tree_context_menu(self, position):
@@ -1780,7 +2206,7 @@ class JsonFormatterWindow(QWidget):
 
         # 全局选项
         expand_all_action = menu.addAction("展开全部")
-        expand_all_action.triggered.connect(self.output_tree.expandAll)
+        expand_all_action.triggered.connect(self.expand_all_tree_items)
         
         collapse_all_action = menu.addAction("折叠全部")
         collapse_all_action.triggered.connect(self.output_tree.collapseAll)
@@ -1827,17 +2253,27 @@ class JsonFormatterWindow(QWidget):
         """
         压缩 JSON 并更新树与右侧结果
         """
-        text = self.input_edit.toPlainText().strip()
-        if not text:
+        # 取消尚未触发的防抖自动格式化，免得它稍后把压缩结果换回格式化结果
+        self.auto_format_timer.stop()
+        text = self.input_edit.toPlainText()
+        if not text or text.isspace():
+            return
+        self.parse_generation += 1  # 作废仍在后台解析的自动格式化结果
+        parsed_text, fingerprint = self.parsed_input
+        if text == parsed_text and fingerprint == self.tree_fingerprint:
+            # 同一输入已解析过且树就是这份数据：结构指纹本身就是压缩结果，无需解析和序列化
+            self.set_output_text(fingerprint)
             return
         try:
-            data = json.loads(text)
-            compressed = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
-            # 更新树
-            self.populate_tree(json.loads(compressed))
+            data = json_loads_stripped(text)
+            compressed = json_dumps_compact(data)
+            # 压缩结果就是结构指纹：与当前树一致时树已是最新，压缩只改变右侧文本，不必重建。
+            # 否则直接复用已解析的数据重建树，且不记录指纹——这棵树没有展开嵌套 JSON，
+            # 之后的自动格式化仍需要重建
+            if compressed != self.tree_fingerprint:
+                self.update_tree(data)
             # 更新右侧文本并高亮
-            self.output_edit.setPlainText(compressed)
-            self.highlighter.rehighlight()
+            self.set_output_text(compressed)
         except json.JSONDecodeError as e:
             QMessageBox.critical(self, "压缩失败", f"{e.msg}\n行: {e.lineno}, 列: {e.colno}")
 
@@ -2024,6 +2460,10 @@ class JsonFormatterWindow(QWidget):
                 with open(file_name, 'r', encoding='utf-8') as f:
                     text = f.read()
                 self.input_edit.setPlainText(text)
+                # 文件内容已经在手上：取消 textChanged 触发的防抖解析，直接交给后台解析，
+                # 省去防抖等待，也不用再从编辑器里把整份文本取出来一遍
+                self.auto_format_timer.stop()
+                self.start_background_parse(text)
             except Exception as e:
                 QMessageBox.critical(self, "打开失败", str(e))
 
@@ -2105,18 +2545,229 @@ class JsonFormatterWindow(QWidget):
         if key:
             self.search_panels[key].prev_match()
 
-class JsonHighlighter(QSyntaxHighlighter):
+# ====== JSON 语法高亮分词 ======
+JSON_NUMBER_CHARS = frozenset("0123456789+-.eE")
+JSON_LITERALS = (("true", "bool"), ("false", "bool"), ("null", "null"))
+JSON_WORD_PATTERN = re.compile(r'\w*')  # 连续的单词字符（字母、数字、下划线，含中文等）
+
+# 字符分类表：按 ord(字符) 查表得到 token 起始类别，代替逐个字符比较的 if/elif 链；
+# 表只覆盖 ASCII，其余字符一律视为 CHAR_OTHER
+CHAR_OTHER, CHAR_QUOTE, CHAR_NUMBER, CHAR_LITERAL, CHAR_SLASH = range(5)
+JSON_CHAR_CLASSES = bytes(
+    CHAR_QUOTE if ch == '"'
+    else CHAR_NUMBER if ch in "-0123456789"
+    else CHAR_LITERAL if ch in "tfn"
+    else CHAR_SLASH if ch == '/'
+    else CHAR_OTHER
+    for ch in map(chr, range(128))
+)
+
+
+def is_json_word_char(ch):
+    return ch == '_' or ch.isalnum()
+
+
+def tokenize_json(text):
+    """
+    从左到右单次扫描一行 JSON 文本，依次产出 (起始位置, 长度, 类型)。
+    类型为 key / string / number / bool / null，与 JsonHighlighter.formats 的键对应。
+    字符串只标记引号内的内容，后面（跳过空白）紧跟冒号的字符串视为 key。
+    数字和 true / false / null 两侧必须不是单词字符（nullable、v2 之类整个单词都不高亮），
+    字符串之外的 // 起到行尾是注释（如解析警告行），不再高亮。
+    """
+    classes = JSON_CHAR_CLASSES
+    length = len(text)
+    i = 0
+    while i < length:
+        code = ord(text[i])
+        char_class = classes[code] if code < 128 else CHAR_OTHER
+        if char_class == CHAR_OTHER:
+            i += 1
+        elif char_class == CHAR_QUOTE:
+            start = i + 1
+            end = text.find('"', start)
+            # 跳过被转义的引号（前面紧挨着奇数个反斜杠）
+            while end != -1:
+                k = end - 1
+                while k >= start and text[k] == '\\':
+                    k -= 1
+                if (end - 1 - k) % 2 == 0:
+                    break
+                end = text.find('"', end + 1)
+            if end == -1:
+                # 未闭合的字符串一直高亮到行尾
+                if length > start:
+                    yield start, length - start, "string"
+                return
+            i = end + 1
+            while i < length and text[i] in ' \t':
+                i += 1
+            if end > start:
+                yield start, end - start, "key" if i < length and text[i] == ':' else "string"
+        elif char_class == CHAR_SLASH:
+            if text.startswith('/', i + 1):
+                return
+            i += 1
+        else:
+            start = i
+            kind = None
+            if char_class == CHAR_NUMBER:
+                i += 1
+                while i < length and text[i] in JSON_NUMBER_CHARS:
+                    i += 1
+                kind = "number"
+            else:
+                for word, word_kind in JSON_LITERALS:
+                    if text.startswith(word, i):
+                        i += len(word)
+                        kind = word_kind
+                        break
+            if kind is not None and (
+                    not (start and is_json_word_char(text[start - 1]))
+                    and not (i < length and is_json_word_char(text[i]))):
+                yield start, i - start, kind
+            else:
+                # 不是独立的数字或字面量：跳过所在单词的剩余部分
+                i = max(JSON_WORD_PATTERN.match(text, i).end(), start + 1)
+
+
+# ====== 搜索高亮 ======
+# BMP 以外的字符（如 emoji）在 QTextDocument 中占两个位置（UTF-16 代理对）
+ASTRAL_CHAR_PATTERN = re.compile('[\U00010000-\U0010ffff]')
+
+
+def find_text_positions(text, keyword):
+    """
+    查找 keyword 在 text 中所有不重叠的出现位置（忽略大小写，与 QTextDocument.find 默认行为一致）。
+    在 Python 字符串上用正则一次性查找，返回换算成 QTextDocument 位置（UTF-16 偏移）的列表
+    """
+    pattern = re.compile(re.escape(keyword), re.IGNORECASE)
+    positions = [m.start() for m in pattern.finditer(text)]
+    if positions and ASTRAL_CHAR_PATTERN.search(text):
+        astral = [m.start() for m in ASTRAL_CHAR_PATTERN.finditer(text)]
+        positions = [pos + bisect.bisect_left(astral, pos) for pos in positions]
+    return positions
+
+
+class SearchHighlighter(QSyntaxHighlighter):
+    """
+    标出文档中所有搜索匹配（只加背景色，保留原有的语法高亮颜色）。
+    代替为每个匹配创建一个 ExtraSelection：匹配再多，绘制时也只涉及可见的文本块，
+    关键字变化时也只重新高亮含有新旧关键字的文本块。
+    """
     def __init__(self, parent=None):
         super().__init__(parent)
         self.theme = THEMES["light"]
+        self.search_keyword = ""
+        self.search_pattern = None
         self.update_formats()
 
+    def set_theme(self, theme_config):
+        self.theme = theme_config
+        self.update_formats()
+        if self.search_pattern is not None:
+            self.rehighlight()
+
+    def update_formats(self):
+        self.search_background = QColor(self.theme["highlight"]["search_match"])
+        self.search_format = QTextCharFormat()
+        self.search_format.setBackground(self.search_background)
+
+    def set_search_keyword(self, keyword, positions=None, old_positions=None):
+        """
+        切换搜索关键字。positions / old_positions 是新旧关键字在当前文本中的匹配位置，
+        调用方已经查找过时直接传入，省去再扫描整篇文本；不传（None）时在这里查找
+        """
+        if keyword == self.search_keyword:
+            return
+        # 只有含旧关键字（去掉高亮）或新关键字（加上高亮）的文本块需要重新高亮
+        if old_positions is None or positions is None:
+            text = self.document().toPlainText()
+            if old_positions is None:
+                old_positions = find_text_positions(text, self.search_keyword) if self.search_keyword else []
+            if positions is None:
+                positions = find_text_positions(text, keyword) if keyword else []
+        self.search_keyword = keyword
+        self.search_pattern = re.compile(re.escape(keyword), re.IGNORECASE) if keyword else None
+        self.rehighlight_positions(sorted(old_positions + positions))
+
+    def rehighlight_positions(self, positions):
+        """
+        重新高亮包含这些位置（已排序）的文本块，每个文本块只处理一次
+        """
+        doc = self.document()
+        # 与 QSyntaxHighlighter.rehighlight 一样包在一个编辑块里：每个 rehighlightBlock 都会让文档发出
+        # contentsChanged，编辑器的 textChanged 合并成结束时的一次（整篇操作只响应 text_modified，不受格式变化影响）
+        cursor = QTextCursor(doc)
+        cursor.beginEditBlock()
+        block_end = -1
+        for pos in positions:
+            if pos < block_end:
+                continue
+            block = doc.findBlock(pos)
+            block_end = block.position() + block.length()
+            self.rehighlightBlock(block)
+        cursor.endEditBlock()
+
+    def match_spans(self, text, pos=0):
+        """
+        返回一行文本中从 pos 起所有匹配的 (起始, 结束) UTF-16 偏移
+        """
+        spans = [m.span() for m in self.search_pattern.finditer(text, pos)]
+        if spans and ASTRAL_CHAR_PATTERN.search(text):
+            # 文本块中的位置按 UTF-16 计算，BMP 以外的字符要多算一位
+            astral = [m.start() for m in ASTRAL_CHAR_PATTERN.finditer(text)]
+            spans = [(start + bisect.bisect_left(astral, start), end + bisect.bisect_left(astral, end))
+                     for start, end in spans]
+        return spans
+
+    def block_match_selections(self, block):
+        """
+        返回某个文本块内全部匹配的 ExtraSelection（用于叠加在当前行高亮之上）
+        """
+        if self.search_pattern is None:
+            return []
+        selections = []
+        position = block.position()
+        for start, end in self.match_spans(block.text()):
+            cursor = QTextCursor(block)
+            cursor.setPosition(position + start)
+            cursor.setPosition(position + end, QTextCursor.KeepAnchor)
+            selection = QTextEdit.ExtraSelection()
+            selection.cursor = cursor
+            selection.format = self.search_format
+            selections.append(selection)
+        return selections
+
+    def highlightBlock(self, text):
+        if self.search_pattern is None:
+            return
+        # 大部分文本块不含关键字：先查一次第一个匹配，没有就直接返回；有则从这里接着找，不重复扫描前面的文本
+        first_match = self.search_pattern.search(text)
+        if first_match is None:
+            return
+        for start, end in self.match_spans(text, first_match.start()):
+            self.set_search_format(start, end)
+
+    def set_search_format(self, start, end):
+        """
+        给一处匹配加上搜索背景色。纯文本没有其它格式，直接套用预先构造好的 search_format
+        """
+        self.setFormat(start, end - start, self.search_format)
+
+
+class JsonHighlighter(SearchHighlighter):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.block_tokens = []  # 正在高亮的文本块中的 token，叠加搜索背景色时使用
+
     def set_theme(self, theme_config):
         self.theme = theme_config
         self.update_formats()
         self.rehighlight()
 
     def update_formats(self):
+        super().update_formats()
         colors = self.theme["highlight"]
         self.formats = {
             "key": self.make_format(colors["key"]),
@@ -2126,6 +2777,12 @@ class JsonHighlighter(QSyntaxHighlighter):
             "null": self.make_format(colors["null"]),
             "highlight": self.make_format(colors["highlight_fg"], bg=colors["highlight_bg"], bold=True)
         }
+        # 各类 token 叠加搜索背景色后的格式，高亮匹配时直接套用，不必逐字符取出再合并
+        self.search_formats = {}
+        for kind, fmt in self.formats.items():
+            search_fmt = QTextCharFormat(fmt)
+            search_fmt.setBackground(self.search_background)
+            self.search_formats[kind] = search_fmt
 
     def make_format(self, color, bg=None, bold=False):
         fmt = QTextCharFormat()
@@ -2137,28 +2794,33 @@ class JsonHighlighter(QSyntaxHighlighter):
         return fmt
 
     def highlightBlock(self, text):
-        import re
-
-        # ---- 1. 匹配 key ----
-        for match in re.finditer(r'"(.*?)"\s*:', text):
-            self.setFormat(match.start(1), match.end(1) - match.start(1), self.formats["key"])
-
-        # ---- 2. 匹配字符串 ----
-        # 冒号后面跟双引号里的内容，包括日期时间等
-        for match in re.finditer(r':\s*"([^"]*)"', text):
-            self.setFormat(match.start(1), match.end(1) - match.start(1), self.formats["string"])
-
-        # ---- 3. 匹配布尔值/Null ----
-        # 只匹配不在引号内的 true/false/null
-        for match in re.finditer(r':\s*(true|false|null)(?=[,\}\]])', text):
-            val = match.group(1)
-            fmt = self.formats["null"] if val == "null" else self.formats["bool"]
-            self.setFormat(match.start(1), match.end(1) - match.start(1), fmt)
-
-        # ---- 4. 匹配数字 ----
-        # 只匹配冒号后跟的纯数字，不匹配带空格或在字符串内的数字
-        for match in re.finditer(r':\s*(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)(?=[,\}\]])', text):
-            self.setFormat(match.start(1), match.end(1) - match.start(1), self.formats["number"])
+        # 单次扫描整行，按 token 类型直接套用对应格式（每个文本块都会调用，循环内只用局部变量）
+        formats = self.formats
+        set_format = self.setFormat
+        tokens = self.block_tokens = list(tokenize_json(text))
+        for start, length, kind in tokens:
+            set_format(start, length, formats[kind])
+        # 在语法高亮之上叠加搜索匹配的背景色（没有搜索时省掉这次调用）
+        if self.search_pattern is not None:
+            super().highlightBlock(text)
+
+    def set_search_format(self, start, end):
+        """
+        匹配范围先整体套上搜索背景色，再把与 token 重叠的部分换成该 token 带背景色的格式，
+        保留语法高亮的前景色
+        """
+        set_format = self.setFormat
+        set_format(start, end - start, self.search_format)
+        search_formats = self.search_formats
+        for token_start, length, kind in self.block_tokens:
+            if token_start >= end:
+                break
+            token_end = token_start + length
+            if token_end <= start:
+                continue
+            overlap_start = start if start > token_start else token_start
+            overlap_end = end if end < token_end else token_end
+            set_format(overlap_start, overlap_end - overlap_start, search_formats[kind])
 
 
 from PySide6.QtWidgets import QWidget, QLineEdit, QLabel, QPushButton, QHBoxLayout
@@ -2171,6 +2833,7 @@ class SearchPanel(QWidget):
         self.editor = editor
         # self.setFixedWidth(320)  # 移除固定宽度
         self.theme = THEMES["light"]
+        self.update_formats()
 
         # 布局
         layout = QHBoxLayout(self)
@@ -2191,13 +2854,14 @@ class SearchPanel(QWidget):
         layout.addWidget(self.btn_next)
         layout.addWidget(self.btn_close)
 
-        # 高亮器
-        # self.highlighter = SearchHighlighter(self.editor.document())
-
         self.matches = []
         self.index = 0
+        self.matches_stale = False  # 搜索后文本又被修改过，跳转前需要重新查找
+        self.highlighted_matches = []  # 搜索高亮器当前标出的匹配位置，文本修改后失效（None）
 
         # 信号
+        if isinstance(self.editor, CodeEditor):
+            self.editor.text_modified.connect(self.mark_matches_stale)
         self.btn_close.clicked.connect(self.close_search)
         self.search_edit.textChanged.connect(self.do_search)
         self.search_edit.returnPressed.connect(self.next_match)
@@ -2208,8 +2872,22 @@ class SearchPanel(QWidget):
         self.search_edit.clear()
         self.hide()
 
+    def update_formats(self):
+        # 搜索高亮用到的格式按主题构造一次，跳转匹配时直接复用
+        highlight = self.theme['highlight']
+        self.match_format = QTextCharFormat()
+        self.match_format.setBackground(QColor(highlight['search_match']))
+        self.current_match_format = QTextCharFormat()
+        self.current_match_format.setBackground(QColor(highlight['search_current']))
+        self.current_match_format.setForeground(QColor(highlight['highlight_fg']))
+        self.current_match_format.setFontWeight(QFont.Bold)
+        self.current_line_format = QTextCharFormat()
+        self.current_line_format.setBackground(QColor(self.theme['current_line']))
+        self.current_line_format.setProperty(QTextFormat.FullWidthSelection, True)
+
     def set_theme(self, theme_config):
         self.theme = theme_config
+        self.update_formats()
         # 设置面板样式
         self.setStyleSheet(f"""
             SearchPanel {{
@@ -2251,34 +2929,56 @@ class SearchPanel(QWidget):
         text = self.search_edit.text()
         if isinstance(self.editor, CodeEditor):
             self.editor.expand_all_folds()
-        self.highlight_search(text)
-
-        self.matches.clear()
-
-        if not text:
-            self.label.setText("0 / 0")
-            return
+        self.find_matches(text)
+        self.index = 0
+        self.update_label()
 
-        doc = self.editor.document()
-        cursor = QTextCursor(doc)
-        cursor.setPosition(0)
+        if self.matches:
+            self.goto(0)
+        else:
+            self.highlight_search(text)
 
-        # 查找所有匹配位置
-        while True:
-            found = doc.find(text, cursor)
-            if found.isNull():
-                break
+    def find_matches(self, keyword):
+        """
+        查找所有匹配位置（一次取出纯文本后在 Python 字符串上查找，不再逐个调用 doc.find）
+        """
+        self.matches = find_text_positions(self.editor.toPlainText(), keyword) if keyword else []
+        self.matches_stale = False
 
-            # 使用独立 cursor，避免被 find 内部复用导致高亮错乱
-            cursor = QTextCursor(found)
+    def mark_matches_stale(self):
+        self.matches_stale = True
+        self.highlighted_matches = None
 
-            self.matches.append(cursor.selectionStart())
+    def set_highlighter_keyword(self, highlighter, keyword):
+        """
+        更新搜索高亮器的关键字：新关键字的位置就是刚查找到的 matches，旧关键字的位置是上次标出的匹配，
+        都直接交给高亮器，不再重复扫描文本
+        """
+        positions = self.matches if keyword else []
+        highlighter.set_search_keyword(keyword, positions, self.highlighted_matches)
+        self.highlighted_matches = positions
 
-        self.index = 0
-        self.update_label()
+    def refresh_matches(self):
+        # 文本在搜索之后被修改过时重新查找，保证跳转与高亮的位置和当前内容一致
+        if self.matches_stale:
+            self.find_matches(self.search_edit.text())
+            self.index = min(self.index, max(len(self.matches) - 1, 0))
 
-        if self.matches:
-            self.goto(0)
+    def match_selections(self, length):
+        """
+        为全部匹配位置构造 ExtraSelection（共用同一个格式对象）
+        """
+        doc = self.editor.document()
+        selections = []
+        for pos in self.matches:
+            cursor = QTextCursor(doc)
+            cursor.setPosition(pos)
+            cursor.setPosition(pos + length, QTextCursor.KeepAnchor)
+            sel = QTextEdit.ExtraSelection()
+            sel.cursor = cursor
+            sel.format = self.match_format
+            selections.append(sel)
+        return selections
 
     def update_label(self):
         if not self.matches:
@@ -2295,20 +2995,14 @@ class SearchPanel(QWidget):
         keyword = self.search_edit.text()
         length = len(keyword)
         doc = self.editor.document()
-        extra = []
 
-        # 全部匹配（每个 selection 都用 QTextCursor 的拷贝）
-        cursor_iter = QTextCursor(doc)
-        while True:
-            cursor_iter = doc.find(keyword, cursor_iter)
-            if cursor_iter.isNull():
-                break
-            sel = QTextEdit.ExtraSelection()
-            sel.cursor = QTextCursor(cursor_iter)  # <-- 显式拷贝
-            fmt_all = QTextCharFormat()
-            fmt_all.setBackground(QColor(self.theme['highlight']['search_match']))  # 主题色
-            sel.format = fmt_all
-            extra.append(sel)
+        # 全部匹配：由编辑器的搜索高亮器标出，没有高亮器时才逐个创建 ExtraSelection
+        highlighter = getattr(self.editor, 'search_highlighter', None)
+        if highlighter is not None:
+            self.set_highlighter_keyword(highlighter, keyword)
+            extra = []
+        else:
+            extra = self.match_selections(length)
 
         # ---------- 在这里加入“整行浅蓝色高亮”（空选区 + FullWidthSelection） ----------
         # 注意：必须在设置所有搜索高亮之前构造或附加该项，以便同时显示
@@ -2319,11 +3013,8 @@ class SearchPanel(QWidget):
             line_cursor.setPosition(current_pos)
             line_sel = QTextEdit.ExtraSelection()
             line_sel.cursor = QTextCursor(line_cursor)  # 空选区的独立 cursor
-            line_fmt = line_sel.format
             # 使用主题中的当前行颜色
-            line_fmt.setBackground(QColor(self.theme['current_line']))  
-            line_fmt.setProperty(QTextFormat.FullWidthSelection, True)
-            line_sel.format = line_fmt
+            line_sel.format = self.current_line_format
             # 将整行高亮放到 extra 的最前面（视觉上与关键字红色叠加良好）
             extra.insert(0, line_sel)
 
@@ -2333,12 +3024,8 @@ class SearchPanel(QWidget):
         cur.movePosition(QTextCursor.Right, QTextCursor.KeepAnchor, length)
         sel_cur = QTextEdit.ExtraSelection()
         sel_cur.cursor = QTextCursor(cur)  # <-- 拷贝
-        fmt = QTextCharFormat()
-        fmt.setBackground(QColor(self.theme['highlight']['search_current']))  # 主题色
-        fmt.setForeground(QColor(self.theme['highlight']['highlight_fg']))  # 主题色
-        fmt.setFontWeight(QFont.Bold)
         # 不要把 FullWidthSelection 设置成 True —— 否则会覆盖整行蓝色
-        sel_cur.format = fmt
+        sel_cur.format = self.current_match_format
         extra.append(sel_cur)
 
         # 应用 ExtraSelections（包含：整行蓝 + 所有绿 + 当前红）
@@ -2355,20 +3042,21 @@ class SearchPanel(QWidget):
             self.editor.expand_folds_for_position(current_pos)
         self.editor.ensureCursorVisible()
 
-        # 强制刷新（确保视觉更新）
+        # 强制刷新（确保视觉更新）；搜索高亮器只会重新高亮受影响的文本块，这里不需要整篇 rehighlight
         self.editor.viewport().update()
-        # 尝试调用 parent 的 highlighter 刷新，如果有的话
-        if hasattr(self.parent, 'highlighter'):
-            self.parent.highlighter.rehighlight()
         self.update_label()
 
     def next_match(self):
+        self.refresh_matches()
         if not self.matches:
+            self.update_label()
             return
         self.goto((self.index + 1) % len(self.matches))
 
     def prev_match(self):
+        self.refresh_matches()
         if not self.matches:
+            self.update_label()
             return
         self.goto((self.index - 1) % len(self.matches))
 
@@ -2379,9 +3067,10 @@ class SearchPanel(QWidget):
           - 当前匹配：主题配置 search_current
           - 当前行整行：主题配置 current_line
         """
-        extra = []
-
+        highlighter = getattr(self.editor, 'search_highlighter', None)
         if not keyword:
+            if highlighter is not None:
+                self.set_highlighter_keyword(highlighter, "")
             if isinstance(self.editor, CodeEditor):
                 self.editor.set_search_selections([])
             else:
@@ -2389,19 +3078,14 @@ class SearchPanel(QWidget):
             return
 
         doc = self.editor.document()
-        cursor = QTextCursor(doc)
+        self.refresh_matches()
 
         # 全部匹配
-        while True:
-            cursor = doc.find(keyword, cursor)
-            if cursor.isNull():
-                break
-            sel = QTextEdit.ExtraSelection()
-            sel.cursor = QTextCursor(cursor)
-            fmt_all = QTextCharFormat()
-            fmt_all.setBackground(QColor(self.theme['highlight']['search_match']))
-            sel.format = fmt_all
-            extra.append(sel)
+        if highlighter is not None:
+            self.set_highlighter_keyword(highlighter, keyword)
+            extra = []
+        else:
+            extra = self.match_selections(len(keyword))
 
         # 当前匹配红色 + 整行浅蓝
         if current_pos is not None:
@@ -2411,10 +3095,7 @@ class SearchPanel(QWidget):
                 line_cursor.setPosition(current_pos)
                 line_sel = QTextEdit.ExtraSelection()
                 line_sel.cursor = QTextCursor(line_cursor)
-                line_fmt = line_sel.format
-                line_fmt.setBackground(QColor(self.theme['current_line']))
-                line_fmt.setProperty(QTextFormat.FullWidthSelection, True)
-                line_sel.format = line_fmt
+                line_sel.format = self.current_line_format
                 extra.insert(0, line_sel)
 
             # 当前匹配红色背景 + 白字
@@ -2423,11 +3104,7 @@ class SearchPanel(QWidget):
             keyword_cursor.movePosition(QTextCursor.Right, QTextCursor.KeepAnchor, len(keyword))
             sel_cur = QTextEdit.ExtraSelection()
             sel_cur.cursor = QTextCursor(keyword_cursor)
-            fmt = QTextCharFormat()
-            fmt.setBackground(QColor(self.theme['highlight']['search_current']))
-            fmt.setForeground(QColor(self.theme['highlight']['highlight_fg']))
-            fmt.setFontWeight(QFont.Bold)
-            sel_cur.format = fmt
+            sel_cur.format = self.current_match_format
             extra.append(sel_cur)
 
         if isinstance(self.editor, CodeEditor):
@@ -2455,7 +3132,7 @@ class TreeSearchPanel(SearchPanel):
     """
     def __init__(self, parent, editor):
         super().__init__(parent, editor)
-        self.tree_matches = []  # 存储匹配的 (QTreeWidgetItem, match_index)
+        self.tree_matches = []  # 存储匹配的 (节点路径, match_index)，跳转时才创建对应节点
 
     def do_search(self):
         text = self.search_edit.text()
@@ -2463,39 +3140,43 @@ class TreeSearchPanel(SearchPanel):
         # 触发高亮 (设置全局 keyword)
         self.highlight_search(text)
         
-        self.tree_matches.clear()
-        
         # 记得清除之前的高亮（如果有的话）
         self.index = 0
-        
-        if not text:
-            self.label.setText("0 / 0")
-            return
-
-        import re
-        try:
-            pattern = re.compile(re.escape(text), re.IGNORECASE)
-            
-            # 遍历树的所有节点
-            iterator = QTreeWidgetItemIterator(self.editor)
-            while iterator.value():
-                item = iterator.value()
-                item_text = item.text(0)
-                
-                # 查找该节点内的所有匹配
-                matches = list(pattern.finditer(item_text))
-                for i in range(len(matches)):
-                    self.tree_matches.append((item, i))
-                    
-                iterator += 1
-        except Exception:
-            pass
+        self.find_matches(text)
 
         self.update_label()
 
         if self.tree_matches:
             self.goto(0)
 
+    def find_matches(self, keyword):
+        """
+        直接在数据上搜索所有节点的文字（包括尚未展开过的），不必先创建整棵树
+        """
+        self.tree_matches.clear()
+        self.matches_stale = False
+        if not keyword:
+            return
+        window = self.editor.window()
+        pattern = re.compile(re.escape(keyword), re.IGNORECASE)
+        for path, item_text in window.iter_tree_item_texts():
+            # 查找该节点内的所有匹配
+            match_count = len(pattern.findall(item_text))
+            for i in range(match_count):
+                self.tree_matches.append((path, i))
+
+    def mark_matches_stale(self):
+        # 树被重建：旧节点已删除，当前匹配的节点引用也要一起清掉
+        self.matches_stale = True
+        delegate = self.editor.itemDelegate()
+        if hasattr(delegate, 'set_current_match'):
+            delegate.set_current_match(None, -1)
+
+    def refresh_matches(self):
+        if self.matches_stale:
+            self.find_matches(self.search_edit.text())
+            self.index = min(self.index, max(len(self.tree_matches) - 1, 0))
+
     def update_label(self):
         if not self.tree_matches:
             self.label.setText("0 / 0")
@@ -2511,7 +3192,11 @@ class TreeSearchPanel(SearchPanel):
             return
 
         self.index = idx
-        item, match_index = self.tree_matches[idx]
+        path, match_index = self.tree_matches[idx]
+        # 只创建从根到匹配节点这一条路径上的节点
+        item = self.editor.window().tree_item_at(path)
+        if item is None:
+            return
 
         # 1. 确保父节点全部展开
         parent = item.parent()
@@ -2532,12 +3217,16 @@ class TreeSearchPanel(SearchPanel):
         self.update_label()
 
     def next_match(self):
+        self.refresh_matches()
         if not self.tree_matches:
+            self.update_label()
             return
         self.goto((self.index + 1) % len(self.tree_matches))
 
     def prev_match(self):
+        self.refresh_matches()
         if not self.tree_matches:
+            self.update_label()
             return
         self.goto((self.index - 1) % len(self.tree_matches))
 